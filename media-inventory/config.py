@@ -1,17 +1,33 @@
+import os
+
 # File extensions
 VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mkv', '.mov')
+VIDEO_EXTENSION_SET = frozenset(VIDEO_EXTENSIONS)  # For constant-time suffix lookups while walking
 SUBTITLE_EXTENSIONS = ('.srt', '.sub', '.idx', '.ass', '.ssa')
 
 # FFprobe settings
 FFPROBE_PATH = 'ffprobe'  # Assumes ffprobe is in PATH. Change if needed.
+# Smaller probe limits for --fast-probe (ffprobe defaults: 5MB / 5s). Files whose
+# streams are not fully described within these limits are probed again with the defaults.
+FFPROBE_FAST_ARGS = ['-probesize', '1000000', '-analyzeduration', '1000000']
+# The format and stream fields read by video_analysis, so ffprobe does not emit the rest.
+# Only used when the full ffprobe output is not requested.
+FFPROBE_SHOW_ENTRIES = (
+    'format=filename,format_name,duration,size,bit_rate:format_tags:'
+    'stream=index,codec_type,codec_name,profile,level,width,height,avg_frame_rate,bit_rate,'
+    'color_space,color_transfer,pix_fmt,bits_per_raw_sample,bits_per_sample,'
+    'channels,channel_layout,sample_rate:stream_tags:stream_disposition'
+)
 
 # Output settings
 DEFAULT_OUTPUT_FOLDER = 'output'
 DEFAULT_CSV_FILENAME = 'media_inventory.csv'
 DEFAULT_STATS_FILENAME = 'media_inventory_statistics.txt'
+DEFAULT_CACHE_FILENAME = 'ffprobe_cache.db'  # Stored in the output folder unless overridden
 
 # CSV settings
 CSV_DELIMITER = '\t'  # Tab-delimited by default
+CSV_LINE_TERMINATOR = '\n'  # Ends the header and every row
 
 # Verbosity levels
 VERBOSITY_QUIET = 0
@@ -19,7 +35,9 @@ VERBOSITY_NORMAL = 1
 VERBOSITY_VERBOSE = 2
 
 # Performance settings
-CHUNK_SIZE = 1024 * 1024  # 1MB chunks for file reading
+CHUNK_SIZE = 1024 * 1024  # 1MB chunks for file reading and writing
+DEFAULT_JOBS = min(32, (os.cpu_count() or 1) * 2)  # Concurrent ffprobe workers
+PROGRESS_INTERVAL = 0.1  # Minimum seconds between progress line redraws
 
 # Statistics settings
 TOP_BOTTOM_COUNT = 10  # Number of top/bottom items to show in statistics
@@ -86,7 +104,10 @@ RESOLUTION_CATEGORIES = {
 }
 
 # HDR formats
-HDR_FORMATS = ['smpte2084', 'arib-std-b67']
+HDR_FORMATS = frozenset({'smpte2084', 'arib-std-b67'})
+
+# Audio languages left out of the 'Non eng/nor languages' column
+EXPECTED_AUDIO_LANGUAGES = frozenset({'eng', 'nor', 'und'})
 
 # Audio settings
 MAX_AUDIO_STREAMS = 4  # Maximum number of audio streams to consider separately in statistics
@@ -100,4 +121,7 @@ CSV_FIELDNAMES = [
     'Audio Channels', 'Audio Channel Layouts', 'Audio Sample Rates', 'Audio Bitrates', 'Audio Stream Count',
     'Subtitle Languages', 'Subtitle languages in file', 'Subtitle formats in file', 'Subtitle stream count in file',
     'Subtitles in file and folder', 'Creation Date', 'Modification Date', 'Raw ffprobe output'
-]
\ No newline at end of file
+]
+
+# Precomputed header row, written as-is (none of the names need quoting)
+CSV_HEADER_LINE = CSV_DELIMITER.join(CSV_FIELDNAMES) + CSV_LINE_TERMINATOR
\ No newline at end of file
@@ -1,12 +1,14 @@
-import json
 import os
-import csv
+import functools
+import operator
+import time
 from colorama import Fore, Style # type: ignore
 from video_analysis import get_video_metadata
-from utils import print_progress, count_files
-from config import VIDEO_EXTENSIONS, CSV_FIELDNAMES, CSV_DELIMITER
+from probe_cache import ProbeCache
+from utils import print_progress, collect_video_files, dump_json, cancelling_executor
+from config import CSV_FIELDNAMES, CSV_DELIMITER, CSV_LINE_TERMINATOR, CSV_HEADER_LINE, DEFAULT_JOBS, CHUNK_SIZE, PROGRESS_INTERVAL
 
-def process_videos(root_folder, output_folder, output_file, verbosity, delimiter, full_ffprobe_output, pretty_json):
+def process_videos(root_folder, output_folder, output_file, verbosity, delimiter, full_ffprobe_output, pretty_json, jobs=DEFAULT_JOBS, cache_path=None, fast_probe=False):
     """
     Process video files in the given folder and its subfolders, extracting metadata and writing to a CSV file.
     
@@ -17,11 +19,15 @@ def process_videos(root_folder, output_folder, output_file, verbosity, delimiter
     verbosity (int): The level of output detail (0, 1, or 2).
     full_ffprobe_output (bool): Whether to include full ffprobe output in the Raw ffprobe output column.
     pretty_json (bool): Whether to format JSON output for readability.
+    jobs (int): Number of ffprobe processes to run concurrently (1 probes serially).
+    cache_path (str): Path to the ffprobe cache database, or None to disable caching.
+    fast_probe (bool): Whether to try smaller ffprobe probe limits first.
 
     Returns:
     tuple: A tuple containing lists of processed files, failed files, and all metadata.
     """
-    total_files = count_files(root_folder, verbosity)
+    video_paths = collect_video_files(root_folder, verbosity)
+    total_files = len(video_paths)
     processed_files = []
     failed_files = []
     metadata_list = []
@@ -31,48 +37,64 @@ def process_videos(root_folder, output_folder, output_file, verbosity, delimiter
     os.makedirs(output_folder, exist_ok=True)
     csv_path = os.path.join(output_folder, output_file)
 
-    with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDNAMES, delimiter=CSV_DELIMITER, 
-                                quoting=csv.QUOTE_MINIMAL, quotechar='"', escapechar='\\')
-        writer.writeheader()
+    cache = ProbeCache(cache_path) if cache_path else None
+    probe = functools.partial(get_video_metadata, full_ffprobe_output=full_ffprobe_output, pretty_json=pretty_json, cache=cache, fast_probe=fast_probe)
 
-        for root, _, files in os.walk(root_folder):
-            for file in files:
-                if file.lower().endswith(VIDEO_EXTENSIONS):
-                    file_path = os.path.join(root, file)
-                    
-                    if verbosity == 1:
-                        progress = f"{len(processed_files) + len(failed_files) + 1}/{total_files} ({(len(processed_files) + len(failed_files) + 1)/total_files*100:.2f}%) - {file}"
-                        print_progress(progress)
-                    elif verbosity >= 2:
-                        print(f"\n{Fore.GREEN}Processing {len(processed_files) + len(failed_files) + 1}/{total_files}: {file}{Style.RESET_ALL}")
+    # A large buffer batches the per-row writes into few write calls
+    with open(csv_path, 'w', newline='', encoding='utf-8', buffering=CHUNK_SIZE) as csvfile, \
+            cancelling_executor(max(1, jobs)) as executor:
+        csvfile.write(CSV_HEADER_LINE)
+
+        # Built once: the row values come from a single itemgetter call and are
+        # formatted in one step, with the raw ffprobe output as the last column
+        get_row_values = operator.itemgetter(*CSV_FIELDNAMES[:-1])
+        row_format = CSV_DELIMITER.join(['%s'] * len(CSV_FIELDNAMES)) + CSV_LINE_TERMINATOR
+
+        if jobs > 1:
+            # ffprobe runs in the worker threads; rows are written here, in walk order
+            results = [executor.submit(probe, file_path).result for file_path in video_paths]
+        else:
+            # Serial mode probes each file only when its row is reached
+            results = [functools.partial(probe, file_path) for file_path in video_paths]
+
+        last_progress_update = 0.0
+
+        for index, (file_path, result) in enumerate(zip(video_paths, results), 1):
+            file = os.path.basename(file_path)
+
+            if verbosity == 1:
+                # Throttle redraws of the progress line
+                now = time.monotonic()
+                if now - last_progress_update >= PROGRESS_INTERVAL or index == total_files:
+                    last_progress_update = now
+                    progress = f"{index}/{total_files} ({index/total_files*100:.2f}%) - {file}"
+                    print_progress(progress)
+            elif verbosity >= 2:
+                print(f"\n{Fore.GREEN}Processing {index}/{total_files} ({index/total_files*100:.2f}%): {file}{Style.RESET_ALL}")
+            
+            try:
+                metadata = result()
+                
+                if metadata:
+                    # Handle 'Raw ffprobe output' separately
+                    raw_output = metadata.pop('Raw ffprobe output', '')
+                    # Manually write the row as a string, including the raw ffprobe output
+                    csvfile.write(row_format % (*get_row_values(metadata), dump_json(raw_output)))
                     
-                    try:
-                        metadata = get_video_metadata(file_path, full_ffprobe_output, pretty_json)
-                        
-                        if metadata:
-                            # Handle 'Raw ffprobe output' separately
-                            raw_output = metadata.pop('Raw ffprobe output', '')
-                            # Convert metadata to a list of values, maintaining the order of fieldnames
-                            row_values = [metadata.get(field, '') for field in CSV_FIELDNAMES[:-1]]  # Exclude 'Raw ffprobe output' from fieldnames
-                            # Manually write the row as a string, including the raw ffprobe output
-                            row_string = CSV_DELIMITER.join(str(value) for value in row_values)
-                            row_string += CSV_DELIMITER + json.dumps(raw_output, indent=2 if pretty_json else None)
-                            csvfile.write(row_string + '\n')
-                            
-                            metadata_list.append(metadata)
-                            processed_files.append(file_path)
-                            
-                            if verbosity >= 2:
-                                print(f"{Fore.YELLOW}Metadata: {metadata}{Style.RESET_ALL}")
-                                
-                    except Exception as e:
-                        error_message = f"Error processing {file_path}: {str(e)}"
-                        print(f"{Fore.RED}{error_message}{Style.RESET_ALL}")
-                        failed_files.append((file_path, error_message))
+                    metadata_list.append(metadata)
+                    processed_files.append(file_path)
                     
                     if verbosity >= 2:
-                        print(f"{Fore.GREEN}Progress: {len(processed_files) + len(failed_files)}/{total_files} ({(len(processed_files) + len(failed_files))/total_files*100:.2f}%){Style.RESET_ALL}")
+                        print(f"{Fore.YELLOW}Metadata: {metadata}{Style.RESET_ALL}")
+                        
+            except Exception as e:
+                # The message is formatted when it is shown; the statistics list the path next to it
+                failed_files.append((file_path, str(e)))
+                if verbosity >= 1:
+                    print(f"{Fore.RED}Error processing {file_path}: {e}{Style.RESET_ALL}")
+
+    if cache:
+        cache.close()
 
     if verbosity >= 1:
         print()  # Move to the next line after processing
@@ -22,6 +22,10 @@ Options:
     --delimiter CHAR        Custom delimiter for CSV output [default: tab]
     --full-ffprobe          Include full ffprobe output in the Raw ffprobe output column
     --pretty-json           Output raw JSON data in multi-line format (default is single line)
+    -j N, --jobs N          Number of files to probe concurrently, 1 to probe serially [default: 2x CPU count, max 32]
+    --cache-file PATH       Path to the ffprobe cache database [default: ffprobe_cache.db in the output directory]
+    --no-cache              Always run ffprobe, ignoring and not updating the cache
+    --fast-probe            Probe with smaller limits first, retrying with the defaults when stream info is incomplete
 
 Output:
     The script generates two main output files:
@@ -40,12 +44,14 @@ Features:
       * Audio tracks, languages, and formats
       * Subtitle information
     - Progress reporting during the scanning and analysis process
+    - Caching of ffprobe results, so unchanged files are not probed again on the next run
     - Customizable output options
 
 Requirements:
-    - Python 3.6+
+    - Python 3.9+
     - FFprobe (part of the FFmpeg package)
     - Required Python packages: colorama, tqdm
+    - Optional Python packages: orjson (faster parsing of FFprobe output and writing of the raw JSON column)
 
 Note:
     Ensure that FFprobe is installed and accessible in your system PATH.
@@ -77,10 +83,12 @@ import time
 
 from config import (
     DEFAULT_OUTPUT_FOLDER,
+    DEFAULT_CACHE_FILENAME,
     VERBOSITY_QUIET,
     VERBOSITY_NORMAL,
     VERBOSITY_VERBOSE,
-    CSV_DELIMITER
+    CSV_DELIMITER,
+    DEFAULT_JOBS
 )
 
 def main():
@@ -101,6 +109,14 @@ def main():
                         help="Include full ffprobe output in the Raw ffprobe output column")
     parser.add_argument("--pretty-json", action="store_true", 
                         help="Output raw JSON data in multi-line format (default is single line)")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"Number of files to probe concurrently, 1 to probe serially (default: {DEFAULT_JOBS})")
+    parser.add_argument("--cache-file", 
+                        help=f"Path to the ffprobe cache database (default: {DEFAULT_CACHE_FILENAME} in the output directory)")
+    parser.add_argument("--no-cache", action="store_true", 
+                        help="Always run ffprobe, ignoring and not updating the cache")
+    parser.add_argument("--fast-probe", action="store_true",
+                        help="Probe with smaller limits first, retrying with the defaults when stream info is incomplete")
     
     args = parser.parse_args()
 
@@ -127,10 +143,15 @@ def main():
     
     stats_file = f"{timestamp} - {sanitized_folder_name} - statistics.txt"
 
+    if args.no_cache:
+        cache_path = None
+    else:
+        cache_path = args.cache_file if args.cache_file else os.path.join(output_folder, DEFAULT_CACHE_FILENAME)
+
     print(f"{Fore.CYAN}Starting Media Inventory process...{Style.RESET_ALL}")
     
     start_time = time.time()
-    processed_files, failed_files, metadata_list = process_videos(args.root_folder, output_folder, output_file, args.verbosity, args.delimiter, args.full_ffprobe, args.pretty_json)
+    processed_files, failed_files, metadata_list = process_videos(args.root_folder, output_folder, output_file, args.verbosity, args.delimiter, args.full_ffprobe, args.pretty_json, args.jobs, cache_path, args.fast_probe)
     
     stats = generate_statistics(args.root_folder, start_time, processed_files, failed_files, metadata_list)
     process_audio_streams(stats, metadata_list)
@@ -0,0 +1,65 @@
+import sqlite3
+import threading
+
+class ProbeCache:
+    """
+    A persistent cache of ffprobe output, stored in a SQLite database.
+
+    Entries are keyed by file path and only returned while the file's size and
+    modification time are unchanged, so re-running a scan over an
+    unchanged library skips ffprobe entirely.
+    """
+
+    def __init__(self, cache_path):
+        """
+        Open (or create) the cache database.
+
+        Args:
+        cache_path (str): Path to the SQLite database file.
+        """
+        # The connection is shared by the ffprobe worker threads, guarded by a lock
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(cache_path, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS probe (path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, json BLOB)"
+        )
+
+    def get(self, file_path, stat):
+        """
+        Look up the cached ffprobe output for a file.
+
+        Args:
+        file_path (str): Absolute path to the video file, optionally suffixed to tell probe variants apart.
+        stat (os.stat_result): The current stat result of the file.
+
+        Returns:
+        bytes: The cached ffprobe output, or None if missing or stale.
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT json FROM probe WHERE path = ? AND mtime = ? AND size = ?",
+                (file_path, stat.st_mtime_ns, stat.st_size)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, file_path, stat, output):
+        """
+        Store the ffprobe output for a file.
+
+        Args:
+        file_path (str): Absolute path to the video file, optionally suffixed to tell probe variants apart.
+        stat (os.stat_result): The stat result of the file when it was probed.
+        output (bytes): The ffprobe JSON output.
+        """
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO probe (path, mtime, size, json) VALUES (?, ?, ?, ?)",
+                (file_path, stat.st_mtime_ns, stat.st_size, output)
+            )
+
+    def close(self):
+        """Close the cache database."""
+        with self.lock:
+            self.connection.close()
@@ -12,7 +12,7 @@ def generate_statistics(root_folder, start_time, processed_files, failed_files,
     root_folder (str): The root folder that was scanned.
     start_time (float): The start time of the script execution.
     processed_files (list): List of successfully processed files.
-    failed_files (list): List of files that failed to process.
+    failed_files (list): List of (file path, error message) tuples for files that failed to process.
     metadata_list (list): List of metadata dictionaries for all processed files.
 
     Returns:
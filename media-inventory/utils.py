@@ -3,7 +3,16 @@ import shutil
 import csv
 from decimal import Decimal
 import os
-from config import LANGUAGE_MAPPING
+import json
+import time
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from config import LANGUAGE_MAPPING, VIDEO_EXTENSION_SET, PROGRESS_INTERVAL
+
+try:
+    import orjson # type: ignore
+except ImportError:
+    orjson = None  # Optional, falls back to the standard json module
 
 def format_time(seconds):
     """
@@ -144,6 +153,62 @@ def print_progress(message):
     sys.stdout.write('\r' + message[:terminal_width - 1])
     sys.stdout.flush()
 
+def load_json(data):
+    """
+    Parse a JSON document, using orjson when it is installed.
+
+    Args:
+    data (bytes or str): The JSON document.
+
+    Returns:
+    The parsed JSON value.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dump_json(value, pretty=False):
+    """
+    Serialize a value to a JSON string, using orjson when it is installed.
+
+    The standard json fallback is formatted like orjson, so the output does not
+    depend on whether orjson is available.
+
+    Args:
+    value: The value to serialize.
+    pretty (bool): Whether to indent the output for readability.
+
+    Returns:
+    str: The JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 if pretty else 0).decode('utf-8')
+    if pretty:
+        return json.dumps(value, indent=2, ensure_ascii=False)
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+@contextlib.contextmanager
+def cancelling_executor(max_workers):
+    """
+    Thread pool context manager that drops queued work if the block is interrupted.
+
+    A plain ThreadPoolExecutor waits for every submitted task on exit, so Ctrl-C
+    would keep probing the rest of the library.
+
+    Args:
+    max_workers (int): Number of worker threads.
+
+    Yields:
+    ThreadPoolExecutor: The executor.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        yield executor
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown(wait=True)
+
 def remove_statistics_tags(tags):
     """
     Remove statistics tags from a dictionary.
@@ -175,17 +240,61 @@ def custom_quoting(field):
         return csv.QUOTE_NONE
     return csv.QUOTE_MINIMAL
 
-def count_files(root_folder, verbosity):
-    count = 0
-    for root, _, files in os.walk(root_folder):
-        for file in files:
-            if file.lower().endswith(('.mp4', '.avi', '.mkv', '.mov')):
-                count += 1
-                if verbosity >= 1:
-                    print_progress(f"{count} files discovered - Searching {root}")
+def iter_video_files(root_folder):
+    """
+    Recursively yield the paths of all video files under a folder.
+
+    Uses os.scandir so that files and folders are told apart from the
+    directory entry itself, without a separate stat call per entry.
+
+    Args:
+    root_folder (str): The root folder to search.
+
+    Yields:
+    str: The path of each video file found.
+    """
+    pending = [root_folder]
+    while pending:
+        folder = pending.pop()
+        subfolders = []
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            subfolders.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in VIDEO_EXTENSION_SET:
+                        yield entry.path
+        except OSError:
+            continue
+        # Reversed so folders are visited in listing order, like os.walk
+        pending.extend(reversed(subfolders))
+
+def collect_video_files(root_folder, verbosity):
+    """
+    Collect the paths of all video files under a folder, reporting progress.
+
+    Args:
+    root_folder (str): The root folder to search.
+    verbosity (int): The level of output detail (0, 1, or 2).
+
+    Returns:
+    list: The paths of all video files found.
+    """
+    video_paths = []
+    last_progress_update = 0.0
+    for file_path in iter_video_files(root_folder):
+        video_paths.append(file_path)
+        if verbosity >= 1:
+            now = time.monotonic()
+            if now - last_progress_update >= PROGRESS_INTERVAL:
+                last_progress_update = now
+                print_progress(f"{len(video_paths)} files discovered - Searching {os.path.dirname(file_path)}")
     if verbosity >= 1:
+        if video_paths:
+            print_progress(f"{len(video_paths)} files discovered - Searching {os.path.dirname(video_paths[-1])}")
         print()  # Move to the next line after counting
-    return count
+    return video_paths
 
 def safe_get_stat(stats, *keys, default="Error"):
     """
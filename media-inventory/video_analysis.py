@@ -1,13 +1,98 @@
 import os
-import json
+import functools
 import subprocess
 from datetime import datetime
-from colorama import Fore, Style # type: ignore
 
-from utils import safe_float, remove_statistics_tags
-from config import FFPROBE_PATH, SUBTITLE_EXTENSIONS, HDR_FORMATS, LANGUAGE_MAPPING
+from utils import safe_float, remove_statistics_tags, load_json, dump_json
+from config import FFPROBE_PATH, FFPROBE_SHOW_ENTRIES, FFPROBE_FAST_ARGS, SUBTITLE_EXTENSIONS, HDR_FORMATS, LANGUAGE_MAPPING, EXPECTED_AUDIO_LANGUAGES
 
-def get_video_metadata(file_path, full_ffprobe_output=False, pretty_json=False):
+def run_ffprobe(file_path, cache=None, stat=None, full_output=True, fast=False):
+    """
+    Run ffprobe on a video file, reusing a cached result when available.
+
+    Args:
+    file_path (str): Path to the video file.
+    cache (ProbeCache): Cache of earlier ffprobe results, or None to always probe.
+    stat (os.stat_result): The file's stat result, if the caller already has it.
+    full_output (bool): Whether to request every field, or only FFPROBE_SHOW_ENTRIES.
+    fast (bool): Whether to try the smaller FFPROBE_FAST_ARGS probe limits first.
+
+    Returns:
+    bytes: The JSON output of ffprobe.
+    """
+    if full_output:
+        show_args = ['-show_format', '-show_streams']
+    else:
+        show_args = ['-show_entries', FFPROBE_SHOW_ENTRIES]
+    cmd = [FFPROBE_PATH, '-v', 'quiet', '-print_format', 'json', *show_args, file_path]
+    if cache is None:
+        return execute_ffprobe(cmd, fast).stdout
+
+    abs_path = os.path.abspath(file_path)
+    if stat is None:
+        stat = os.stat(abs_path)
+    # Reduced and fast probes get their own keys, so other runs never reuse them
+    cache_key = abs_path if full_output else f"{abs_path}|{FFPROBE_SHOW_ENTRIES}"
+    if fast:
+        cache_key += '|fast'
+    output = cache.get(cache_key, stat)
+    if output is None:
+        result = execute_ffprobe(cmd, fast)
+        output = result.stdout
+        if result.returncode == 0:
+            cache.put(cache_key, stat, output)
+    return output
+
+def execute_ffprobe(cmd, fast=False):
+    """
+    Execute an ffprobe command, optionally trying the fast probe limits first.
+
+    A fast probe is only kept when it fully describes the video and audio streams;
+    otherwise the file is probed again with ffprobe's default limits.
+
+    Args:
+    cmd (list): The ffprobe command line.
+    fast (bool): Whether to try FFPROBE_FAST_ARGS first.
+
+    Returns:
+    subprocess.CompletedProcess: The result of the accepted ffprobe run.
+    """
+    if fast:
+        result = subprocess.run([cmd[0], *FFPROBE_FAST_ARGS, *cmd[1:]], capture_output=True)
+        if result.returncode == 0 and has_stream_info(result.stdout):
+            return result
+    return subprocess.run(cmd, capture_output=True)
+
+def has_stream_info(output):
+    """
+    Check whether ffprobe output describes the streams well enough to use.
+
+    Args:
+    output (bytes): The JSON output of ffprobe.
+
+    Returns:
+    bool: True if the duration, the video codec, size and frame rate, and the
+    codec, channels and sample rate of every audio stream are known.
+    """
+    try:
+        data = load_json(output)
+    except ValueError:
+        return False
+    streams = data.get('streams', [])
+    video_stream = next((s for s in streams if s.get('codec_type') == 'video'), None)
+    return bool(
+        video_stream
+        and data.get('format', {}).get('duration')
+        and video_stream.get('codec_name')
+        and video_stream.get('width')
+        and parse_frame_rate(video_stream.get('avg_frame_rate', '0/1'))
+        and all(
+            s.get('codec_name') and s.get('channels') and s.get('sample_rate')
+            for s in streams if s.get('codec_type') == 'audio'
+        )
+    )
+
+def get_video_metadata(file_path, full_ffprobe_output=False, pretty_json=False, cache=None, fast_probe=False):
     """
     Extract metadata from a video file using ffprobe.
 
@@ -15,136 +100,188 @@ def get_video_metadata(file_path, full_ffprobe_output=False, pretty_json=False):
     file_path (str): Path to the video file.
     full_ffprobe_output (bool): Whether to include full ffprobe output.
     pretty_json (bool): Whether to format JSON output for readability.
+    cache (ProbeCache): Cache of earlier ffprobe results, or None to always probe.
+    fast_probe (bool): Whether to try smaller ffprobe probe limits first.
 
     Returns:
     dict: A dictionary containing the extracted metadata.
     """
-    try:
-        # Run ffprobe command
-        cmd = [
-            FFPROBE_PATH, '-v', 'quiet', '-print_format', 'json',
-            '-show_format', '-show_streams', file_path
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        # Parse the JSON output
-        data = json.loads(result.stdout)
-        
-        # Extract required metadata
-        format_info = data['format']
-        video_stream = next((s for s in data['streams'] if s['codec_type'] == 'video'), None)
-        audio_streams = [s for s in data['streams'] if s['codec_type'] == 'audio']
-        subtitle_streams = [s for s in data['streams'] if s['codec_type'] == 'subtitle']
-        
-        # Calculate video bitrate
-        duration = safe_float(format_info.get('duration', 0))
-        file_size = safe_float(format_info.get('size', 0))
-        video_bitrate = (file_size * 8) / (duration * 1000000) if duration > 0 else 0
-        
-        # Calculate BPPPF
-        width = safe_float(video_stream.get('width', 0))
-        height = safe_float(video_stream.get('height', 0))
-        frame_rate = safe_float(video_stream.get('avg_frame_rate', '0/1').split('/')[0]) / safe_float(video_stream.get('avg_frame_rate', '0/1').split('/')[1])
-        bpppf = (video_bitrate * 1000000) / (width * height * frame_rate) if all([width, height, frame_rate]) else 0
-
-        # Check for HDR content
-        hdr = 'Yes' if video_stream.get('color_transfer', '').lower() in HDR_FORMATS else 'No'
-        
-        # Gather audio information
-        audio_languages = [s.get('tags', {}).get('language', 'und') for s in audio_streams]
-        audio_codecs = [s.get('codec_name', 'unknown') for s in audio_streams]
-        audio_channels = [s.get('channels', 0) for s in audio_streams]
-        audio_channel_layouts = [s.get('channel_layout', 'unknown') for s in audio_streams]
-        audio_sample_rates = [s.get('sample_rate', 'unknown') for s in audio_streams]
-        audio_bitrates = [float(s.get('bit_rate', 0)) / 1000 for s in audio_streams]  # Convert to kbps
-        
-        # Gather subtitle information
-        subtitle_languages_file = [s.get('tags', {}).get('language', 'und') for s in subtitle_streams]
-        subtitle_formats_file = [s.get('codec_name', 'unknown') for s in subtitle_streams]
-        
-        # Get subtitles in folder
-        folder_path = os.path.dirname(file_path)
-        file_name = os.path.splitext(os.path.basename(file_path))[0]
-        subtitles_in_folder = []
-        subtitle_languages_folder = []
-
-        for f in os.listdir(folder_path):
-            if any(f.lower().endswith(ext) for ext in SUBTITLE_EXTENSIONS):
-                if f.startswith(file_name):
-                    subtitles_in_folder.append(f)
-                    # Extract language code
-                    parts = os.path.splitext(f)[0].split('.')
-                    if len(parts) > 1:
-                        lang = parts[-1]
-                        if len(lang) == 2 or len(lang) == 3:  # Assuming 2 or 3 letter language codes
-                            subtitle_languages_folder.append(lang)
-
-        # Combine and deduplicate subtitle languages
-        all_subtitle_languages = list(set(subtitle_languages_file + subtitle_languages_folder))
-        
-        # Subtitles in both file and folder
-        subtitles_in_file_and_folder = list(set(subtitle_languages_file + subtitle_languages_folder))
-        
-        # Audio languages dedup
-        audio_languages_dedup = list(dict.fromkeys(audio_languages))
-        
-        # Non eng/nor languages
-        non_eng_nor_languages = list(set([lang for lang in audio_languages_dedup if lang not in ['eng', 'nor', 'und']]))
-
-        # Get bits
-        bits = get_video_bits(video_stream)
-
-        # Prepare the raw ffprobe output JSON
-        if full_ffprobe_output:
-            raw_output = json.dumps(data, indent=2 if pretty_json else None)
-        else:
-            raw_output = json.dumps(prepare_reduced_raw_output(format_info, video_stream, audio_streams, subtitle_streams), indent=2 if pretty_json else None)
-
-        metadata = {
-            'File': os.path.basename(file_path),
-            'Extension': os.path.splitext(file_path)[1],
-            'Path': os.path.dirname(file_path),
-            'Filesize (in GB)': round(float(format_info.get('size', 0)) / (1024 * 1024 * 1024), 2),
-            'Container Format': format_info.get('format_name', 'unknown'),
-            'Video Codec': video_stream.get('codec_name', 'unknown'),
-            'Profile': video_stream.get('profile', 'unknown'),
-            'Level': video_stream.get('level', 'unknown'),
-            'Overall Bitrate (in mbps)': round(float(format_info.get('bit_rate', 0)) / 1_000_000, 2),
-            'Video bitrate (in mbps)': round(video_bitrate, 2),
-            'BPPPF': round(bpppf, 6),
-            'Width': width,
-            'Height': height,
-            'Color Space': video_stream.get('color_space', 'unknown'),
-            'HDR': 'Yes' if video_stream.get('color_transfer', '').lower() in ['smpte2084', 'arib-std-b67'] else 'No',
-            'Bits': bits,
-            'Duration': format_info.get('duration', 'unknown'),
-            'Frame Rate': round(frame_rate, 2),
-            'Audio Languages': ', '.join(audio_languages),
-            'Audio Languages details': ', '.join([f"{lang}: {codec}, {ch}ch ({layout}), {sr}Hz, {br:.0f}kbps" 
-                for lang, codec, ch, layout, sr, br in zip(audio_languages, audio_codecs, audio_channels, audio_channel_layouts, audio_sample_rates, audio_bitrates)]),
-            'Audio Channels': ', '.join([str(ch) for ch in audio_channels]),
-            'Audio Channel Layouts': ', '.join(audio_channel_layouts),
-            'Audio Languages dedup': ', '.join(audio_languages_dedup),
-            'Non eng/nor languages': ', '.join(non_eng_nor_languages),
-            'Default language': next((s.get('tags', {}).get('language', 'und') for s in audio_streams if s.get('disposition', {}).get('default') == 1), 'unknown'),
-            'Audio Codecs': ', '.join(audio_codecs),
-            'Audio Sample Rates': ', '.join(audio_sample_rates),
-            'Audio Bitrates': ', '.join([f"{br:.0f}" for br in audio_bitrates]),
-            'Audio Stream Count': len(audio_streams),
-            'Subtitle Languages': ', '.join(all_subtitle_languages),
-            'Subtitle languages in file': ', '.join(subtitle_languages_file),
-            'Subtitle formats in file': ', '.join(subtitle_formats_file),
-            'Subtitle stream count in file': len(subtitle_streams),
-            'Subtitles in file and folder': ', '.join(subtitles_in_file_and_folder),
-            'Creation Date': format_info.get('tags', {}).get('creation_time', 'unknown'),
-            'Modification Date': datetime.fromtimestamp(os.path.getmtime(file_path)).isoformat(),
-            'Raw ffprobe output': raw_output
-        }
-        
-        return metadata
-    except Exception as e:
-        print(f"{Fore.RED}Error processing {file_path}: {str(e)}{Style.RESET_ALL}")
-        return None
+    # A single stat serves both the cache lookup and the modification date
+    stat = os.stat(file_path)
+
+    # Run ffprobe command and parse the JSON output
+    data = load_json(run_ffprobe(file_path, cache, stat, full_ffprobe_output, fast_probe))
+    
+    # Extract required metadata
+    format_info = data['format']
+    video_stream = None
+    audio_streams = []
+    subtitle_streams = []
+    for stream in data['streams']:
+        codec_type = stream['codec_type']
+        if codec_type == 'video':
+            if video_stream is None:
+                video_stream = stream
+        elif codec_type == 'audio':
+            audio_streams.append(stream)
+        elif codec_type == 'subtitle':
+            subtitle_streams.append(stream)
+    
+    # Calculate video bitrate
+    duration = safe_float(format_info.get('duration', 0))
+    file_size = safe_float(format_info.get('size', 0))
+    video_bitrate = (file_size * 8) / (duration * 1000000) if duration > 0 else 0
+    
+    # Calculate BPPPF
+    width = safe_float(video_stream.get('width', 0))
+    height = safe_float(video_stream.get('height', 0))
+    frame_rate = parse_frame_rate(video_stream.get('avg_frame_rate', '0/1'))
+    bpppf = (video_bitrate * 1000000) / (width * height * frame_rate) if all([width, height, frame_rate]) else 0
+
+    # Check for HDR content (ffprobe reports color_transfer in lowercase)
+    hdr = 'Yes' if video_stream.get('color_transfer') in HDR_FORMATS else 'No'
+    
+    # Gather audio information in a single pass over the streams
+    audio_languages = []
+    audio_codecs = []
+    audio_channels = []
+    audio_channel_layouts = []
+    audio_sample_rates = []
+    audio_bitrates = []
+    default_language = None
+    for s in audio_streams:
+        language = s.get('tags', {}).get('language', 'und')
+        audio_languages.append(language)
+        audio_codecs.append(s.get('codec_name', 'unknown'))
+        audio_channels.append(s.get('channels', 0))
+        audio_channel_layouts.append(s.get('channel_layout', 'unknown'))
+        audio_sample_rates.append(s.get('sample_rate', 'unknown'))
+        audio_bitrates.append(float(s.get('bit_rate', 0)) / 1000)  # Convert to kbps
+        if default_language is None and s.get('disposition', {}).get('default') == 1:
+            default_language = language
+    if default_language is None:
+        default_language = 'unknown'
+    
+    # Gather subtitle information
+    subtitle_languages_file = []
+    subtitle_formats_file = []
+    for s in subtitle_streams:
+        subtitle_languages_file.append(s.get('tags', {}).get('language', 'und'))
+        subtitle_formats_file.append(s.get('codec_name', 'unknown'))
+    
+    # Get subtitles in folder
+    folder_path, file_name = os.path.split(file_path)
+    base_name, extension = os.path.splitext(file_name)
+    subtitles_in_folder = []
+    subtitle_languages_folder = []
+
+    for f in list_subtitle_files(folder_path):
+        if f.startswith(base_name):
+            subtitles_in_folder.append(f)
+            # Extract language code
+            parts = os.path.splitext(f)[0].split('.')
+            if len(parts) > 1:
+                lang = parts[-1]
+                if len(lang) == 2 or len(lang) == 3:  # Assuming 2 or 3 letter language codes
+                    subtitle_languages_folder.append(lang)
+
+    # Combine and deduplicate subtitle languages
+    all_subtitle_languages = list(set(subtitle_languages_file + subtitle_languages_folder))
+    
+    # Subtitles in both file and folder
+    subtitles_in_file_and_folder = list(set(subtitle_languages_file + subtitle_languages_folder))
+    
+    # Audio languages dedup
+    audio_languages_dedup = list(dict.fromkeys(audio_languages))
+    
+    # Non eng/nor languages
+    non_eng_nor_languages = list(set([lang for lang in audio_languages_dedup if lang not in EXPECTED_AUDIO_LANGUAGES]))
+
+    # Get bits
+    bits = get_video_bits(video_stream)
+
+    # Prepare the raw ffprobe output JSON
+    if full_ffprobe_output:
+        raw_output = dump_json(data, pretty_json)
+    else:
+        raw_output = dump_json(prepare_reduced_raw_output(format_info, video_stream, audio_streams, subtitle_streams), pretty_json)
+
+    metadata = {
+        'File': file_name,
+        'Extension': extension,
+        'Path': folder_path,
+        'Filesize (in GB)': round(file_size / (1024 * 1024 * 1024), 2),
+        'Container Format': format_info.get('format_name', 'unknown'),
+        'Video Codec': video_stream.get('codec_name', 'unknown'),
+        'Profile': video_stream.get('profile', 'unknown'),
+        'Level': video_stream.get('level', 'unknown'),
+        'Overall Bitrate (in mbps)': round(float(format_info.get('bit_rate', 0)) / 1_000_000, 2),
+        'Video bitrate (in mbps)': round(video_bitrate, 2),
+        'BPPPF': round(bpppf, 6),
+        'Width': width,
+        'Height': height,
+        'Color Space': video_stream.get('color_space', 'unknown'),
+        'HDR': hdr,
+        'Bits': bits,
+        'Duration': format_info.get('duration', 'unknown'),
+        'Frame Rate': round(frame_rate, 2),
+        'Audio Languages': ', '.join(audio_languages),
+        'Audio Languages details': ', '.join([f"{lang}: {codec}, {ch}ch ({layout}), {sr}Hz, {br:.0f}kbps" 
+            for lang, codec, ch, layout, sr, br in zip(audio_languages, audio_codecs, audio_channels, audio_channel_layouts, audio_sample_rates, audio_bitrates)]),
+        'Audio Channels': ', '.join([str(ch) for ch in audio_channels]),
+        'Audio Channel Layouts': ', '.join(audio_channel_layouts),
+        'Audio Languages dedup': ', '.join(audio_languages_dedup),
+        'Non eng/nor languages': ', '.join(non_eng_nor_languages),
+        'Default language': default_language,
+        'Audio Codecs': ', '.join(audio_codecs),
+        'Audio Sample Rates': ', '.join(audio_sample_rates),
+        'Audio Bitrates': ', '.join([f"{br:.0f}" for br in audio_bitrates]),
+        'Audio Stream Count': len(audio_streams),
+        'Subtitle Languages': ', '.join(all_subtitle_languages),
+        'Subtitle languages in file': ', '.join(subtitle_languages_file),
+        'Subtitle formats in file': ', '.join(subtitle_formats_file),
+        'Subtitle stream count in file': len(subtitle_streams),
+        'Subtitles in file and folder': ', '.join(subtitles_in_file_and_folder),
+        'Creation Date': format_info.get('tags', {}).get('creation_time', 'unknown'),
+        'Modification Date': datetime.fromtimestamp(stat.st_mtime).isoformat(),
+        'Raw ffprobe output': raw_output
+    }
+    
+    return metadata
+
+@functools.lru_cache(maxsize=64)
+def parse_frame_rate(rate):
+    """
+    Parse an ffprobe frame rate such as '24000/1001' into frames per second.
+
+    A library only uses a handful of distinct rates, so results are cached.
+
+    Args:
+    rate (str): The frame rate as reported by ffprobe.
+
+    Returns:
+    float: The frame rate, or 0 if it is unknown.
+    """
+    num, _, den = rate.partition('/')
+    den = safe_float(den) if den else 1
+    return safe_float(num) / den if den else 0  # ffprobe reports '0/0' when unknown
+
+@functools.lru_cache(maxsize=None)
+def list_subtitle_files(folder_path):
+    """
+    List the subtitle files in a folder.
+
+    The listing is cached per folder, since every video in a season or movie
+    folder would otherwise read the same directory again.
+
+    Args:
+    folder_path (str): Path to the folder.
+
+    Returns:
+    tuple: The names of the subtitle files in the folder.
+    """
+    with os.scandir(folder_path) as entries:
+        return tuple(entry.name for entry in entries if entry.name.lower().endswith(SUBTITLE_EXTENSIONS))
 
 def detect_atmos(audio_stream):
     """
@@ -1,3 +1,5 @@
+import os
+
 # Default video file extensions to process
 DEFAULT_VIDEO_EXTENSIONS = (
     '.mkv', '.mp4', '.avi', '.mov', '.wmv', 
@@ -5,12 +7,25 @@ DEFAULT_VIDEO_EXTENSIONS = (
     '.m2ts', '.ts'
 )
 
+# Extensions of generated screenshots and video samples
+SCREENSHOT_EXTENSION = '.png'
+VIDEO_SAMPLE_EXTENSIONS = ('.mp4', '.mkv', '.avi')
+
 # Default path to save samples
 DEFAULT_SAMPLE_PATH = "./samples"
 
 # Default path to save csv file
 DEFAULT_SAMPLE_CSV_PATH = "./csv"
 
+# Default number of files to inspect in parallel while scanning
+DEFAULT_JOBS = max(1, (os.cpu_count() or 2) // 2)
+
+# Default limit on ffmpeg processes running at the same time
+DEFAULT_MAX_FFMPEG_PROCS = 4
+
+# Default filename of the ffprobe cache database, stored in the screenshot path
+DEFAULT_CACHE_FILENAME = "ffprobe_cache.db"
+
 # Timeout for ffmpeg commands (in seconds)
 FFMPEG_TIMEOUT = 30
 
@@ -82,8 +97,11 @@ FFMPEG_SCREENSHOT_CMD = [
     '-vframes', '1', '{output_file}'
 ]
 
-# FFprobe command template
+# The fields read by video_info, also part of its probe cache keys
+FFPROBE_INFO_ENTRIES = 'format=duration,bit_rate:stream=codec_type,bit_rate'
+
+# FFprobe command template, limited to FFPROBE_INFO_ENTRIES
 FFPROBE_INFO_CMD = [
     'ffprobe', '-v', 'quiet', '-print_format', 'json',
-    '-show_format', '-show_streams', '{input_file}'
+    '-show_entries', FFPROBE_INFO_ENTRIES, '{input_file}'
 ]
\ No newline at end of file
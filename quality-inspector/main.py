@@ -14,7 +14,8 @@ Usage:
                                    [-e EXTENSIONS [EXTENSIONS ...]] [-c COMPARE_PATH]
                                    [-lt LOWER_THRESHOLD] [-ut UPPER_THRESHOLD]
                                    [--ignore-thresholds] [--force-video-samples]
-                                   [--force-all] [-d]
+                                   [--force-all] [-j JOBS] [--max-ffmpeg-procs MAX_FFMPEG_PROCS]
+                                   [--cache-file CACHE_FILE] [--no-cache] [-d]
                                    input_path
 
 Arguments:
@@ -43,6 +44,12 @@ Options:
   --ignore-thresholds   Ignore bitrate thresholds and create video samples for all files
   --force-video-samples Force creation of video samples even if bitrates are within thresholds
   --force-all           Force processing of all videos, even if bitrates are identical
+  -j, --jobs JOBS       Number of files to inspect and sample in parallel (default: half the CPU cores)
+  --max-ffmpeg-procs MAX_FFMPEG_PROCS
+                        Maximum number of ffmpeg processes running at the same time (default: 4)
+  --cache-file CACHE_FILE
+                        Path to the ffprobe cache database (default: ffprobe_cache.db in the screenshot path)
+  --no-cache            Always run ffprobe, ignoring and not updating the cache
   -d, --debug           Enable debug mode with additional output
 
 Examples:
@@ -83,6 +90,7 @@ Notes:
 - In comparison mode, ensure that the directory structure in both input and compare paths match.
 - Bitrate thresholds determine when video samples are generated in comparison mode.
 - The --force-all flag processes all videos, even if their bitrates are identical.
+- ffprobe results are cached per file and reused while its size and modification time are unchanged.
 """
 
 import argparse
@@ -93,6 +101,8 @@ import colorama # type: ignore
 import time
 import textwrap
 from video_processor import VideoProcessor
+from video_info import set_probe_cache
+from probe_cache import ProbeCache
 from utils import generate_summary, setup_logging
 from datetime import timedelta
 from constants import (
@@ -104,6 +114,9 @@ from constants import (
     DEFAULT_UPPER_THRESHOLD,
     DEFAULT_SAMPLE_PATH,
     DEFAULT_SAMPLE_CSV_PATH,
+    DEFAULT_JOBS,
+    DEFAULT_MAX_FFMPEG_PROCS,
+    DEFAULT_CACHE_FILENAME,
     ERROR_MESSAGES,
     Colors,
     Styles
@@ -141,6 +154,14 @@ def parse_arguments():
     parser.add_argument("--force-all", action="store_true", help="Force processing of all videos, even if bitrates are identical")
     parser.add_argument("-e", "--extensions", nargs='+', default=DEFAULT_VIDEO_EXTENSIONS,
                         help=f"List of video file extensions to process (default: {' '.join(DEFAULT_VIDEO_EXTENSIONS)})")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"Number of files to inspect and sample in parallel (default: {DEFAULT_JOBS})")
+    parser.add_argument("--max-ffmpeg-procs", type=int, default=DEFAULT_MAX_FFMPEG_PROCS,
+                        help=f"Maximum number of ffmpeg processes running at the same time (default: {DEFAULT_MAX_FFMPEG_PROCS})")
+    parser.add_argument("--cache-file",
+                        help=f"Path to the ffprobe cache database (default: {DEFAULT_CACHE_FILENAME} in the screenshot path)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always run ffprobe, ignoring and not updating the cache")
     parser.add_argument("-d", "--debug", action="store_true", help="Enable debug mode with additional output")
     parser.add_argument("-lt", "--lower_threshold", type=float, default=DEFAULT_LOWER_THRESHOLD,
                         help=f"Lower bitrate threshold in percent (default: {DEFAULT_LOWER_THRESHOLD})")
@@ -188,10 +209,19 @@ def main():
     print(generate_summary(args))
     print(f"\n{Colors.GREEN}{Styles.BOLD}Starting the video processing...{Colors.RESET}\n")
 
+    cache = None
+    if not args.no_cache:
+        os.makedirs(args.screenshot_path, exist_ok=True)
+        cache = ProbeCache(args.cache_file or os.path.join(args.screenshot_path, DEFAULT_CACHE_FILENAME))
+        set_probe_cache(cache)
+
     # Initialize and run the VideoProcessor
     processor = VideoProcessor(args)
     processor.run()
 
+    if cache:
+        cache.close()
+
     total_elapsed_time = time.time() - start_time
     formatted_time = format_time(total_elapsed_time)
     print(f"{Colors.CYAN}Total processing time: {formatted_time}{Colors.RESET}")
@@ -1,8 +1,16 @@
 import os
 import shutil
+import json
 import logging
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 from colorama import Fore, Style # type: ignore
 
+try:
+    import orjson # type: ignore
+except ImportError:
+    orjson = None  # Optional, falls back to the standard json module
+
 from constants import Colors, Styles, SUCCESS_MESSAGES, PROGRESS_MESSAGES
 
 def setup_logging(verbose, debug):
@@ -29,6 +37,23 @@ def debug_print(message, debug=False):
     if debug:
         print(f"{Colors.CYAN}[DEBUG] {message}{Colors.RESET}")
 
+def load_json(data):
+    """Parse a JSON document, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+@contextlib.contextmanager
+def cancelling_executor(max_workers):
+    """Thread pool that drops queued work instead of draining it when the block raises or is interrupted."""
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        yield executor
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown(wait=True)
+
 def count_directories(path):
     total_dirs = 0
     for root, dirs, files in os.walk(path):
@@ -51,6 +76,8 @@ def generate_summary(args):
         f"{Colors.GREEN}Number of video samples per video:{Colors.RESET} {args.video_samples}",
         f"{Colors.GREEN}Length of each video sample:{Colors.RESET} {args.video_length} seconds",
         f"{Colors.GREEN}Video file extensions to process:{Colors.RESET} {', '.join(args.extensions)}",
+        f"{Colors.GREEN}Parallel inspection jobs:{Colors.RESET} {args.jobs}",
+        f"{Colors.GREEN}Maximum concurrent ffmpeg processes:{Colors.RESET} {args.max_ffmpeg_procs}",
         f"{Colors.GREEN}Force regeneration of existing samples:{Colors.RESET} {'Yes' if args.force else 'No'}",
         f"{Colors.GREEN}Verbose output:{Colors.RESET} {'Enabled' if args.verbose else 'Disabled'}",
         f"{Colors.GREEN}Debug output:{Colors.RESET} {'Enabled' if args.debug else 'Disabled'}",
@@ -1,21 +1,42 @@
-import json
+import functools
 import subprocess
 import shlex
 import os
 
-from utils import debug_print
-from constants import FFPROBE_INFO_CMD, ERROR_MESSAGES
+from utils import debug_print, load_json
+from constants import FFPROBE_INFO_CMD, FFPROBE_INFO_ENTRIES, ERROR_MESSAGES
 
+# Optional persistent ProbeCache, see set_probe_cache
+_probe_cache = None
+
+def set_probe_cache(cache):
+    """Use the given ProbeCache for ffprobe lookups, or disable caching with None."""
+    global _probe_cache
+    _probe_cache = cache
+
+# Probe each path once per run
+@functools.lru_cache(maxsize=None)
 def get_video_info(file_path, debug=False):
     cmd = FFPROBE_INFO_CMD.copy()
     cmd[-1] = cmd[-1].format(input_file=file_path)
+    if _probe_cache:
+        # Bare paths hold full ffprobe output in a cache shared with media-inventory
+        cache_key = f"{os.path.abspath(file_path)}|{FFPROBE_INFO_ENTRIES}"
+        stat = get_file_stat(file_path)
+        output = _probe_cache.get(cache_key, stat)
+        if output is not None:
+            debug_print(f"Using cached ffprobe output for {file_path}", debug)
+            return load_json(output)
     debug_print(f"Executing command: {' '.join(shlex.quote(arg) for arg in cmd)}", debug)
     try:
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True)
-        return json.loads(result.stdout)
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+        if _probe_cache:
+            _probe_cache.put(cache_key, stat, result.stdout)
+        return load_json(result.stdout)
     except subprocess.CalledProcessError as e:
         raise RuntimeError(ERROR_MESSAGES['ffprobe_error'].format(error=str(e)))
 
+@functools.lru_cache(maxsize=None)
 def get_video_bitrate(file_path):
     info = get_video_info(file_path)
     video_stream = next((s for s in info['streams'] if s['codec_type'] == 'video'), None)
@@ -29,5 +50,18 @@ def get_video_duration(file_path):
     info = get_video_info(file_path)
     return float(info['format']['duration'])
 
+# Stat each path once per run
+@functools.lru_cache(maxsize=None)
+def get_file_stat(file_path):
+    return os.stat(file_path)
+
 def get_file_size(file_path):
-    return os.path.getsize(file_path)
\ No newline at end of file
+    return get_file_stat(file_path).st_size
+
+def file_exists(file_path):
+    """Like os.path.exists, but the stat is kept for the later size and cache lookups."""
+    try:
+        get_file_stat(file_path)
+    except OSError:
+        return False
+    return True
@@ -4,10 +4,13 @@ import os
 import random
 import subprocess
 import shlex
+import tempfile
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-from video_info import get_video_bitrate, get_video_duration, get_file_size
-from utils import clear_line, print_progress, debug_print, count_directories
+from video_info import get_video_bitrate, get_video_duration, get_file_size, file_exists
+from utils import clear_line, print_progress, debug_print, count_directories, cancelling_executor
 from constants import (
     Colors,
     FFMPEG_SCREENSHOT_CMD,
@@ -15,9 +18,15 @@ from constants import (
     ERROR_MESSAGES,
     SUCCESS_MESSAGES,
     PROGRESS_MESSAGES,
-    FFMPEG_VIDEO_SAMPLE_CMD
+    FFMPEG_VIDEO_SAMPLE_CMD,
+    SCREENSHOT_EXTENSION,
+    VIDEO_SAMPLE_EXTENSIONS
 )
 
+# Read once at import, as os.umask can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 class VideoProcessor:
     def __init__(self, args):
         self.input_path = args.input_path
@@ -37,6 +46,16 @@ class VideoProcessor:
         self.upper_threshold = args.upper_threshold / 100
         self.ignore_thresholds = args.ignore_thresholds
         self.force_video_samples = args.force_video_samples
+        self.jobs = max(1, args.jobs)
+        self.max_ffmpeg_procs = max(1, args.max_ffmpeg_procs)
+        # Share the cores between the ffmpeg processes that run side by side
+        self.ffmpeg_threads = max(1, (os.cpu_count() or 1) // self.max_ffmpeg_procs)
+        # Files are processed side by side and each one fans out its screenshots,
+        # so cap the ffmpeg processes running at once
+        self.ffmpeg_slots = threading.BoundedSemaphore(self.max_ffmpeg_procs)
+        self.totals_lock = threading.Lock()
+        # Keeps progress and error lines from several file workers apart
+        self.output_lock = threading.Lock()
         self.total_screenshots = 0
         self.total_video_samples = 0
         self.csv_data = []
@@ -73,72 +92,71 @@ class VideoProcessor:
             print(f"{Colors.RED}{ERROR_MESSAGES['path_not_exist'].format(path=self.input_path)}{Colors.RESET}")
             return video_queue
 
-        print(f"{Colors.YELLOW}Counting directories under {self.input_path}{Colors.RESET}")
-        total_dirs = self.count_directories_with_progress(self.input_path)
-        print(f"{Colors.GREEN}Total directories to scan:{Colors.RESET} {total_dirs}")
-
         processed_dirs = 0
         total_files = 0
         queued_files = 0
+        futures = []
 
-        for root, dirs, files in os.walk(self.input_path):
-            processed_dirs += 1
-            rel_path = os.path.relpath(root, self.input_path)
-            
-            video_files = [f for f in files if f.lower().endswith(self.extensions)]
-            total_files += len(video_files)
-            
-            if self.verbose:
-                print(f"\n{Colors.CYAN}Scanning directory {processed_dirs}/{total_dirs}: {rel_path}{Colors.RESET}")
-                print(f"Found {len(video_files)} video files in this directory")
-            
-            for file in video_files:
-                input_file = os.path.join(root, file)
-                if self.comparison_mode:
-                    compare_file = os.path.join(self.compare_path, rel_path, file)
-                    if not os.path.exists(compare_file):
-                        if self.verbose:
-                            print(f"{Colors.YELLOW}Skipping {file} - No matching file in compare path{Colors.RESET}")
-                        compare_file = None
-                else:
-                    compare_file = None
-                
-                file_name_without_ext = os.path.splitext(file)[0]
-                screenshot_dir = os.path.join(self.root_sample_path, rel_path, file_name_without_ext)
+        # Inspect files in a pool while the walk continues
+        with cancelling_executor(self.jobs) as executor:
+            for root, dirs, files in os.walk(self.input_path):
+                processed_dirs += 1
+                rel_path = os.path.relpath(root, self.input_path)
                 
-                should_process_screenshots, should_process_video = self.should_process_video(input_file, compare_file, screenshot_dir)
+                video_files = [f for f in files if f.lower().endswith(self.extensions)]
+                total_files += len(video_files)
                 
-                video_queue.append((input_file, compare_file, screenshot_dir, should_process_screenshots, should_process_video))
-                queued_files += 1
+                if self.verbose:
+                    print(f"\n{Colors.CYAN}Scanning directory {processed_dirs}: {rel_path}{Colors.RESET}")
+                    print(f"Found {len(video_files)} video files in this directory")
                 
-                # Collect CSV data for all files
-                csv_row = self.collect_csv_data(input_file, compare_file, screenshot_dir, 0, 0, should_process_screenshots, should_process_video)
-                self.csv_data.append(csv_row)
+                for file in video_files:
+                    input_file = os.path.join(root, file)
+                    if self.comparison_mode:
+                        compare_file = os.path.join(self.compare_path, rel_path, file)
+                        if not file_exists(compare_file):
+                            if self.verbose:
+                                print(f"{Colors.YELLOW}Skipping {file} - No matching file in compare path{Colors.RESET}")
+                            compare_file = None
+                    else:
+                        compare_file = None
+                    
+                    file_name_without_ext = os.path.splitext(file)[0]
+                    screenshot_dir = os.path.join(self.root_sample_path, rel_path, file_name_without_ext)
+                    
+                    futures.append(executor.submit(self.inspect_video, input_file, compare_file, screenshot_dir))
+                    queued_files += 1
                 
                 if self.verbose:
-                    print(f"{Colors.GREEN}Added to queue: {file} (Screenshots: {'Yes' if should_process_screenshots else 'No'}, Video: {'Yes' if should_process_video else 'No'}){Colors.RESET}")
-            
-            if self.verbose:
-                print(f"{Colors.MAGENTA}Directory summary:{Colors.RESET}")
-                print(f"  - Files in queue: {queued_files}")
-                print(f"  - Files added from this directory: {queued_files - (total_files - len(video_files))}")
-            else:
-                clear_line()
-                print(f"\rTotal video files: {total_files}, Files in queue: {queued_files}, Scanning directory {processed_dirs}/{total_dirs}: {rel_path}", end='', flush=True)
+                    print(f"{Colors.MAGENTA}Directory summary:{Colors.RESET}")
+                    print(f"  - Files in queue: {queued_files}")
+                    print(f"  - Files added from this directory: {queued_files - (total_files - len(video_files))}")
+                else:
+                    clear_line()
+                    print(f"\rTotal video files: {total_files}, Files in queue: {queued_files}, Scanning directory {processed_dirs}: {rel_path}", end='', flush=True)
+
+            # Collect in submission order so the queue and the CSV rows stay aligned
+            for future in futures:
+                queue_entry, csv_row = future.result()
+                video_queue.append(queue_entry)
+                self.csv_data.append(csv_row)
 
         print()  # Print a newline after the progress is complete
-        print(f"{Colors.GREEN}Scan complete. Total videos found: {total_files}, Videos in queue: {queued_files}{Colors.RESET} Starting processing...")
+        print(f"{Colors.GREEN}Scan complete. Directories scanned: {processed_dirs}, Total videos found: {total_files}, Videos in queue: {queued_files}{Colors.RESET} Starting processing...")
         return video_queue
 
-    def count_directories_with_progress(self, path):
-        total_dirs = 0
-        for root, dirs, files in os.walk(path):
-            total_dirs += 1
-            clear_line()
-            print(f"\rFound {total_dirs} directories: {root}", end='', flush=True)
-        clear_line()
-        return total_dirs
-    
+    def inspect_video(self, input_file, compare_file, screenshot_dir):
+        """Decide what to generate for a file and build its initial CSV row."""
+        should_process_screenshots, should_process_video = self.should_process_video(input_file, compare_file, screenshot_dir)
+        
+        # Collect CSV data for all files
+        csv_row = self.collect_csv_data(input_file, compare_file, screenshot_dir, 0, 0, should_process_screenshots, should_process_video)
+        
+        if self.verbose:
+            print(f"{Colors.GREEN}Added to queue: {os.path.basename(input_file)} (Screenshots: {'Yes' if should_process_screenshots else 'No'}, Video: {'Yes' if should_process_video else 'No'}){Colors.RESET}")
+        
+        return (input_file, compare_file, screenshot_dir, should_process_screenshots, should_process_video), csv_row
+
     def should_process_video(self, input_file, compare_file, screenshot_dir):
         self.debug_print(f"Checking if should process {os.path.basename(input_file)}")
         
@@ -149,18 +167,16 @@ class VideoProcessor:
         info_file = os.path.join(screenshot_dir, self.info_filename)
         
         # Check for existing screenshots
-        existing_screenshots = self.directory_has_files(screenshot_dir, '.png')
+        existing_screenshots = self.directory_has_files(screenshot_dir, SCREENSHOT_EXTENSION)
         # Check for existing video samples
-        existing_video_samples = self.directory_has_files(screenshot_dir, ('.mp4', '.mkv', '.avi'))
+        existing_video_samples = self.directory_has_files(screenshot_dir, VIDEO_SAMPLE_EXTENSIONS)
 
-        if os.path.exists(info_file):
-            with open(info_file, 'r') as f:
-                info = json.load(f)
-            
-            input_size = os.path.getsize(input_file)
+        info = self.read_video_info(info_file)
+        if info is not None:
+            input_size = get_file_size(input_file)
             if info['input_size'] == input_size:
                 if compare_file:
-                    compare_size = os.path.getsize(compare_file)
+                    compare_size = get_file_size(compare_file)
                     if info['compare_size'] == compare_size:
                         transcode_ratio = info.get('transcode_bitrate_ratio')
                         
@@ -185,11 +201,11 @@ class VideoProcessor:
 
         # If we reach here, it means we need to process the video
         input_bitrate = get_video_bitrate(input_file)
-        input_size = os.path.getsize(input_file)
+        input_size = get_file_size(input_file)
 
         if compare_file:
             compare_bitrate = get_video_bitrate(compare_file)
-            compare_size = os.path.getsize(compare_file)
+            compare_size = get_file_size(compare_file)
 
             if input_bitrate is None or compare_bitrate is None:
                 if self.verbose:
@@ -214,63 +230,31 @@ class VideoProcessor:
         return not existing_screenshots, not existing_video_samples and should_sample_video
     
     def directory_has_files(self, dir_path, extensions):
-        """Check if the directory contains any files with the given extensions."""
-        for root, _, files in os.walk(dir_path):
-            if any(file.lower().endswith(extensions) for file in files):
-                return True
-        return False
+        """Check if the directory or its subdirectories contain any files with the given extensions."""
+        try:
+            with os.scandir(dir_path) as entries:
+                subdirs = []
+                for entry in entries:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    elif entry.name.lower().endswith(extensions):
+                        return True  # Stop at the first match instead of listing the rest
+        except OSError:
+            return False  # Missing or unreadable directory, like os.walk
+        return any(self.directory_has_files(subdir, extensions) for subdir in subdirs)
 
     def process_video_queue(self, video_queue):
         total_files = len(video_queue)
-        processed_files = 0
-        failed_files = 0
-        
-        for index, (input_file, compare_file, screenshot_dir, should_process_screenshots, should_process_video) in enumerate(video_queue, 1):
-            try:
-                self.debug_print(f"Processing {os.path.basename(input_file)}")
-                self.verbose_print(PROGRESS_MESSAGES['processing_file'].format(
-                    index=index, 
-                    total=total_files, 
-                    filename=os.path.basename(input_file)
-                ))
-                
-                os.makedirs(screenshot_dir, exist_ok=True)
-                duration = get_video_duration(input_file)
-                timestamps = self.get_random_timestamps(duration)
-                self.debug_print(f"Video duration: {duration}, Timestamps: {timestamps}")
-            
-                screenshots_created = 0
-                video_samples_created = 0
-
-                if should_process_screenshots:
-                    screenshots_created = self.create_screenshots(input_file, compare_file, screenshot_dir, timestamps, index, total_files)
-                    self.debug_print(f"Screenshots created: {screenshots_created}")
-
-                if should_process_video:
-                    video_samples_created = self.create_video_samples(input_file, compare_file, screenshot_dir, timestamps[:self.video_samples], index, total_files)
-                    self.debug_print(f"Video samples created: {video_samples_created}")
-
-                if screenshots_created > 0 or video_samples_created > 0:
-                    processed_files += 1
-                    self.verbose_print(SUCCESS_MESSAGES['samples_created'].format(
-                        index=index, 
-                        total=total_files, 
-                        filename=os.path.basename(input_file),
-                        screenshots=screenshots_created,
-                        video_samples=video_samples_created
-                    ))
-                else:
-                    failed_files += 1
-                    self.verbose_print(f"{Colors.RED}Failed {index}/{total_files}: {os.path.basename(input_file)} - No samples created{Colors.RESET}")
-                
-                # Update CSV data with actual results
-                csv_row = self.collect_csv_data(input_file, compare_file, screenshot_dir, screenshots_created, video_samples_created, should_process_screenshots, should_process_video)
-                self.csv_data[index - 1] = csv_row  # Update the existing row
 
-            except Exception as e:
-                failed_files += 1
-                self.verbose_print(f"{Colors.RED}Failed {index}/{total_files}: {os.path.basename(input_file)} - Error: {str(e)}{Colors.RESET}")
-                self.debug_print(f"Exception occurred: {str(e)}")
+        # Sample files in a pool; ffmpeg_slots bounds the running ffmpeg processes
+        with cancelling_executor(self.jobs) as executor:
+            futures = []
+            for index, entry in enumerate(video_queue, 1):
+                futures.append(executor.submit(self.process_queue_entry, index, total_files, *entry))
+            results = [future.result() for future in futures]
+        processed_files = results.count('processed')
+        failed_files = results.count('failed')
 
         print()  # Print a newline after all processing is complete
         print(SUCCESS_MESSAGES['processing_complete'].format(
@@ -280,6 +264,60 @@ class VideoProcessor:
             total_screenshots=self.total_screenshots,
             total_video_samples=self.total_video_samples
         ))
+
+    def process_queue_entry(self, index, total_files, input_file, compare_file, screenshot_dir, should_process_screenshots, should_process_video):
+        """Generate the samples for one queued file. Returns 'processed', 'failed' or 'skipped'."""
+        if not (should_process_screenshots or should_process_video):
+            # Nothing to generate, so skip probing the duration and rebuilding the CSV row
+            self.verbose_print(f"{Colors.YELLOW}Skipped {index}/{total_files}: {os.path.basename(input_file)} - Samples are up to date{Colors.RESET}")
+            return 'skipped'
+
+        try:
+            self.debug_print(f"Processing {os.path.basename(input_file)}")
+            self.verbose_print(PROGRESS_MESSAGES['processing_file'].format(
+                index=index, 
+                total=total_files, 
+                filename=os.path.basename(input_file)
+            ))
+            
+            os.makedirs(screenshot_dir, exist_ok=True)
+            duration = get_video_duration(input_file)
+            timestamps = self.get_random_timestamps(duration)
+            self.debug_print(f"Video duration: {duration}, Timestamps: {timestamps}")
+        
+            screenshots_created = 0
+            video_samples_created = 0
+
+            if should_process_screenshots:
+                screenshots_created = self.create_screenshots(input_file, compare_file, screenshot_dir, timestamps, index, total_files)
+                self.debug_print(f"Screenshots created: {screenshots_created}")
+
+            if should_process_video:
+                video_samples_created = self.create_video_samples(input_file, compare_file, screenshot_dir, timestamps[:self.video_samples], index, total_files)
+                self.debug_print(f"Video samples created: {video_samples_created}")
+
+            if screenshots_created > 0 or video_samples_created > 0:
+                status = 'processed'
+                self.verbose_print(SUCCESS_MESSAGES['samples_created'].format(
+                    index=index, 
+                    total=total_files, 
+                    filename=os.path.basename(input_file),
+                    screenshots=screenshots_created,
+                    video_samples=video_samples_created
+                ))
+            else:
+                status = 'failed'
+                self.verbose_print(f"{Colors.RED}Failed {index}/{total_files}: {os.path.basename(input_file)} - No samples created{Colors.RESET}")
+            
+            # Update CSV data with actual results
+            csv_row = self.collect_csv_data(input_file, compare_file, screenshot_dir, screenshots_created, video_samples_created, should_process_screenshots, should_process_video)
+            self.csv_data[index - 1] = csv_row  # Update the existing row
+            return status
+
+        except Exception as e:
+            self.verbose_print(f"{Colors.RED}Failed {index}/{total_files}: {os.path.basename(input_file)} - Error: {str(e)}{Colors.RESET}")
+            self.debug_print(f"Exception occurred: {str(e)}")
+            return 'failed'
         
     def write_video_info(self, screenshot_dir, input_bitrate, input_size, compare_bitrate, compare_size):
         def bytes_to_gb(bytes_value):
@@ -309,8 +347,16 @@ class VideoProcessor:
         os.makedirs(screenshot_dir, exist_ok=True)
         info_file = os.path.join(screenshot_dir, self.info_filename)
         
-        with open(info_file, 'w') as f:
-            json.dump(info, f, indent=2)
+        # Swap in a uniquely named temp file, so readers never see a partial file
+        fd, temp_file = tempfile.mkstemp(dir=screenshot_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(info, f, indent=2)
+            os.chmod(temp_file, 0o666 & ~_UMASK)  # mkstemp creates it owner-only
+            os.replace(temp_file, info_file)
+        except BaseException:
+            os.unlink(temp_file)
+            raise
 
         if self.verbose:
             print(f"{Colors.GREEN}Video info written to {info_file}:{Colors.RESET}")
@@ -324,18 +370,25 @@ class VideoProcessor:
     def directory_has_screenshots(self, dir_path):
         """Check if the directory or its subdirectories contain any PNG files."""
         for root, _, files in os.walk(dir_path):
-            if any(file.lower().endswith('.png') for file in files):
+            if any(file.lower().endswith(SCREENSHOT_EXTENSION) for file in files):
                 return True
         return False
 
     def get_random_timestamps(self, duration):
         return [random.uniform(0, duration) for _ in range(self.screenshot_samples)]
     
-    def get_rounded_bitrate_ratio(self, screenshot_dir):
-        info_file = os.path.join(screenshot_dir, self.info_filename)
-        if os.path.exists(info_file):
+    def read_video_info(self, info_file):
+        """Load a stored video info file, or return None if there is none."""
+        # Opening directly saves the separate existence check on every file
+        try:
             with open(info_file, 'r') as f:
-                info = json.load(f)
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def get_rounded_bitrate_ratio(self, screenshot_dir):
+        info = self.read_video_info(os.path.join(screenshot_dir, self.info_filename))
+        if info is not None:
             ratio = info.get('transcode_bitrate_ratio')
             if ratio is not None:
                 return str(round(ratio))
@@ -345,59 +398,73 @@ class VideoProcessor:
         screenshots_created = 0
         rounded_ratio = self.get_rounded_bitrate_ratio(screenshot_dir) if self.comparison_mode else ""
 
-        for i, timestamp in enumerate(timestamps, 1):
-            if not (self.verbose or self.debug):
-                self.update_progress(index, total_files, i, self.screenshot_samples, os.path.basename(input_file))
-            elif self.verbose or self.debug:
-                progress = (index / total_files) * 100
-                print_progress(PROGRESS_MESSAGES['creating_screenshots'].format(
-                    index=index, 
-                    total=total_files, 
-                    progress=progress,
-                    current=i,
-                    samples=self.screenshot_samples,
-                    filename=os.path.basename(input_file)
-                ), verbose=True)
-            
-            try:
-                timecode = self.format_timecode(timestamp)
-                
-                if self.comparison_mode:
-                    original_cmd = FFMPEG_SCREENSHOT_CMD.copy()
-                    original_cmd[2] = str(timestamp)
-                    original_cmd[4] = compare_file
-                    original_cmd[7] = f"{screenshot_dir}/scr-{rounded_ratio}-{timecode}-original.png"
-                    
-                    if self.debug:
-                        formatted_cmd = ' '.join(shlex.quote(arg) for arg in original_cmd)
-                        print(f"{Colors.LIGHT_BLUE}Debug: FFmpeg screenshot command (original):{Colors.RESET}")
-                        print(f"{Colors.LIGHT_BLUE}{formatted_cmd}{Colors.RESET}")
-                    
-                    subprocess.run(original_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=FFMPEG_TIMEOUT, check=True)
+        # Each timestamp is an independent seek-and-decode, so the ffmpeg calls for
+        # one file run side by side instead of waiting on each other
+        with ThreadPoolExecutor(max_workers=max(1, min(self.jobs, len(timestamps)))) as executor:
+            results = executor.map(lambda timestamp: self.create_screenshot(input_file, compare_file, screenshot_dir, timestamp, rounded_ratio), timestamps)
+            for i, created in enumerate(results, 1):
+                with self.output_lock:
+                    if not (self.verbose or self.debug):
+                        self.update_progress(index, total_files, i, self.screenshot_samples, os.path.basename(input_file))
+                    elif self.verbose or self.debug:
+                        progress = (index / total_files) * 100
+                        print_progress(PROGRESS_MESSAGES['creating_screenshots'].format(
+                            index=index, 
+                            total=total_files, 
+                            progress=progress,
+                            current=i,
+                            samples=self.screenshot_samples,
+                            filename=os.path.basename(input_file)
+                        ), verbose=True)
+                if created:
+                    screenshots_created += 1
+
+        with self.totals_lock:
+            self.total_screenshots += screenshots_created
+        return screenshots_created
 
-                input_cmd = FFMPEG_SCREENSHOT_CMD.copy()
-                input_cmd[2] = str(timestamp)
-                input_cmd[4] = input_file
-                input_cmd[7] = f"{screenshot_dir}/scr-{rounded_ratio}-{timecode}-{'transcoded' if self.comparison_mode else 'screen'}.png"
+    def create_screenshot(self, input_file, compare_file, screenshot_dir, timestamp, rounded_ratio):
+        """Create the screenshot(s) for a single timestamp. Returns True on success."""
+        try:
+            timecode = self.format_timecode(timestamp)
+            
+            if self.comparison_mode:
+                original_cmd = FFMPEG_SCREENSHOT_CMD.copy()
+                original_cmd[2] = str(timestamp)
+                original_cmd[4] = compare_file
+                original_cmd[7] = f"{screenshot_dir}/scr-{rounded_ratio}-{timecode}-original.png"
+                original_cmd[1:1] = ['-threads', str(self.ffmpeg_threads)]
                 
                 if self.debug:
-                    formatted_cmd = ' '.join(shlex.quote(arg) for arg in input_cmd)
-                    print(f"{Colors.LIGHT_BLUE}Debug: FFmpeg screenshot command (input):{Colors.RESET}")
+                    formatted_cmd = ' '.join(shlex.quote(arg) for arg in original_cmd)
+                    print(f"{Colors.LIGHT_BLUE}Debug: FFmpeg screenshot command (original):{Colors.RESET}")
                     print(f"{Colors.LIGHT_BLUE}{formatted_cmd}{Colors.RESET}")
                 
-                subprocess.run(input_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=FFMPEG_TIMEOUT, check=True)
-                
-                screenshots_created += 1
-            except (subprocess.TimeoutExpired, subprocess.CalledProcessError) as e:
-                error_cmd = original_cmd if self.comparison_mode and "original" in str(e) else input_cmd
-                formatted_cmd = ' '.join(shlex.quote(arg) for arg in error_cmd)
-                if self.verbose or self.debug:
+                self.run_ffmpeg(original_cmd)
+
+            input_cmd = FFMPEG_SCREENSHOT_CMD.copy()
+            input_cmd[2] = str(timestamp)
+            input_cmd[4] = input_file
+            input_cmd[7] = f"{screenshot_dir}/scr-{rounded_ratio}-{timecode}-{'transcoded' if self.comparison_mode else 'screen'}.png"
+            input_cmd[1:1] = ['-threads', str(self.ffmpeg_threads)]
+            
+            if self.debug:
+                formatted_cmd = ' '.join(shlex.quote(arg) for arg in input_cmd)
+                print(f"{Colors.LIGHT_BLUE}Debug: FFmpeg screenshot command (input):{Colors.RESET}")
+                print(f"{Colors.LIGHT_BLUE}{formatted_cmd}{Colors.RESET}")
+            
+            self.run_ffmpeg(input_cmd)
+            
+            return True
+        except (subprocess.TimeoutExpired, subprocess.CalledProcessError) as e:
+            error_cmd = original_cmd if self.comparison_mode and "original" in str(e) else input_cmd
+            formatted_cmd = ' '.join(shlex.quote(arg) for arg in error_cmd)
+            if self.verbose or self.debug:
+                with self.output_lock:
                     print_progress(f"{Colors.RED}Error creating screenshot {timecode} for {os.path.basename(input_file)}:{Colors.RESET}", verbose=True)
                     print_progress(f"{Colors.RED}Command: {formatted_cmd}{Colors.RESET}", verbose=True)
                     print_progress(f"{Colors.RED}{ERROR_MESSAGES['ffmpeg_error'].format(error=str(e))}{Colors.RESET}", verbose=True)
-
-        self.total_screenshots += screenshots_created
-        return screenshots_created
+            return False
     
     def create_video_samples(self, input_file, compare_file, screenshot_dir, timestamps, index, total_files):
         self.debug_print(f"Entering create_video_samples method")
@@ -422,7 +489,7 @@ class VideoProcessor:
                         print(f"{Colors.LIGHT_BLUE}Debug: FFmpeg video sample command (original):{Colors.RESET}")
                         print(f"{Colors.LIGHT_BLUE}{formatted_cmd}{Colors.RESET}")
                     
-                    subprocess.run(original_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=FFMPEG_TIMEOUT, check=True)
+                    self.run_ffmpeg(original_cmd)
 
                 input_cmd = FFMPEG_VIDEO_SAMPLE_CMD.copy()
                 input_cmd[2] = str(timestamp)
@@ -435,7 +502,7 @@ class VideoProcessor:
                     print(f"{Colors.LIGHT_BLUE}Debug: FFmpeg video sample command (input):{Colors.RESET}")
                     print(f"{Colors.LIGHT_BLUE}{formatted_cmd}{Colors.RESET}")
                 
-                subprocess.run(input_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=FFMPEG_TIMEOUT, check=True)
+                self.run_ffmpeg(input_cmd)
                 
                 video_samples_created += 1
                 self.debug_print(f"Video sample {i} created successfully")
@@ -444,13 +511,21 @@ class VideoProcessor:
                 self.debug_print(f"Error type: {type(e).__name__}")
                 self.debug_print(f"Error details: {repr(e)}")
                 if self.verbose or self.debug:
-                    print_progress(f"{Colors.RED}Error creating video sample {timecode} for {os.path.basename(input_file)}:{Colors.RESET}", verbose=True)
-                    print_progress(f"{Colors.RED}Error: {str(e)}{Colors.RESET}", verbose=True)
+                    with self.output_lock:
+                        print_progress(f"{Colors.RED}Error creating video sample {timecode} for {os.path.basename(input_file)}:{Colors.RESET}", verbose=True)
+                        print_progress(f"{Colors.RED}Error: {str(e)}{Colors.RESET}", verbose=True)
 
         self.debug_print(f"Exiting create_video_samples method. Samples created: {video_samples_created}")
-        self.total_video_samples += video_samples_created
+        with self.totals_lock:
+            self.total_video_samples += video_samples_created
         return video_samples_created
     
+    def run_ffmpeg(self, cmd):
+        """Run an ffmpeg command once one of the shared ffmpeg slots is free."""
+        with self.ffmpeg_slots:
+            # Without stdin, ffmpeg leaves the terminal settings alone
+            subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=FFMPEG_TIMEOUT, check=True)
+
     def format_timecode(self, seconds):
         """Convert seconds to a timecode string format."""
         hours = int(seconds // 3600)
@@ -507,7 +582,7 @@ class VideoProcessor:
         
         # Determine screenshot result
         if should_process_screenshots:
-            if self.force and not self.directory_has_files(screenshot_dir, '.png'):
+            if self.force and not self.directory_has_files(screenshot_dir, SCREENSHOT_EXTENSION):
                 csv_row['Screenshot result'] = 'Processed (forced)'
             else:
                 csv_row['Screenshot result'] = 'Processed'
@@ -517,7 +592,7 @@ class VideoProcessor:
         
         # Determine video sample result
         if should_process_video:
-            if self.force and not self.directory_has_files(screenshot_dir, ('.mp4', '.mkv', '.avi')):
+            if self.force and not self.directory_has_files(screenshot_dir, VIDEO_SAMPLE_EXTENSIONS):
                 csv_row['Video Sample result'] = 'Processed (forced)'
             else:
                 csv_row['Video Sample result'] = 'Processed'